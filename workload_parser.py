@@ -1,9 +1,119 @@
-import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import deque
+from typing import NamedTuple, Optional
+import itertools
+import math
+import mmap
 import sys
 import json
 import os
+import stat
+import re
+
+# Prefer orjson for payload (de)serialization; it is optional, so fall back to the stdlib
+try:
+    import orjson
+    encode_json = orjson.dumps
+    decode_json = orjson.loads
+except ImportError:
+    def encode_json(payload) -> bytes:
+        # Same bytes as orjson: compact separators and raw UTF-8 rather than \u escapes,
+        # since the services store string values exactly as they receive them
+        return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+    decode_json = json.loads
+
+# Range of integers every payload encoder accepts
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+def to_int(value: str) -> Optional[int]:
+    """Parse an integer workload argument, returning None if it is not one"""
+    try:
+        number = int(value)
+    except ValueError:
+        return None
+
+    # orjson cannot encode integers outside 64 bits, so treat them as invalid
+    # arguments for every encoder rather than failing on the main thread
+    if not INT64_MIN <= number <= INT64_MAX:
+        return None
+    return number
+
+def to_float(value: str) -> Optional[float]:
+    """Parse a float workload argument, returning None if it is not one"""
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+
+    # NaN and infinities have no JSON form, so they are invalid arguments too
+    if not math.isfinite(number):
+        return None
+    return number
+
+def id_key(value: str):
+    """Key a user/product id by its integer value, as the services parse it, so "01" and "1" match"""
+    entity_id = to_int(value)
+    return value if entity_id is None else entity_id
+
+class Command(NamedTuple):
+    """A workload line split into its parts, with the request payload it sends"""
+    service: str                # USER, PRODUCT or ORDER
+    name: str                   # create, get, update, ...
+    args: list                  # remaining whitespace-separated arguments
+    payload: Optional[bytes]    # encoded request body, None for GETs and invalid arguments
+
+def is_plain(value: str) -> bool:
+    """Check that a string can be placed between JSON quotes without escaping"""
+    return value.isascii() and value.isprintable() and '"' not in value and '\\' not in value
+
+# A non-empty, non-comment line ('#' or '//'), captured without surrounding whitespace
+COMMAND_LINE_RE = re.compile(rb'^[ \t\f\v]*(?!#|//)(\S.*?)[ \t\f\v\r]*$', re.MULTILINE)
+
+# Commands that must not overlap with other commands
+BARRIERS = frozenset({"restart", "shutdown"})
 
 class WorkloadParser:
+    # Shared by every POST; bodies are pre-encoded so the content type must be set explicitly
+    HEADERS = {'Content-Type' : 'application/json'}
+
+    # Number of commands sent concurrently, and so the number of connections kept open.
+    # Stays below the 20 handler threads OrderService runs.
+    MAX_WORKERS = 16
+
+    # Most submitted units of work (single commands or bulk batches) waiting on results
+    MAX_PENDING = 1024
+
+    # Most consecutive create commands sent together in one bulk request
+    BULK_LIMIT = 128
+
+    # Header set on every response of a server with the bulk endpoints. Without it, a
+    # POST to /user/bulk can reach the plain /user handler by prefix, which would apply
+    # part of a batch as a single create, so creates are then sent one by one.
+    BULK_HEADER = 'X-Bulk-Forwarding'
+
+    # Create payloads have a fixed shape, so they are formatted directly instead of
+    # going through the JSON encoder; only used when every string is plain (see is_plain)
+    USER_CREATE_TEMPLATE = '{{"command":"create","id":{},"username":"{}","email":"{}","password":"{}"}}'
+    PRODUCT_CREATE_TEMPLATE = ('{{"command":"create","id":{},"name":"{}","description":"{}",'
+                               '"price":{!r},"quantity":{}}}')
+
+    # Bulk request body wrapped around the already encoded create payloads
+    BULK_PREFIX = b'{"command":"create","items":['
+    BULK_SUFFIX = b']}'
+
+    # Result lines for commands that could not be sent
+    FAILED = b"Failed:  {}"
+    ORDER_FAILED = b'Failed: {"status":"Invalid Request"}'
+
+    # Database file paths
+    DB_FILES = (
+        "compiled/UserService/users.txt",
+        "compiled/ProductService/products.txt",
+        "compiled/OrderService/orders.txt"
+    )
+
     def __init__(self, config_file: str):
         # Read config file to get service endpoints
         with open(config_file, 'r') as f:
@@ -12,259 +122,540 @@ class WorkloadParser:
         # Store base URLs for services
         self.order_service_url = f"http://{config['OrderService']['ip']}:{config['OrderService']['port']}"
 
+        # Endpoints are fixed for the whole run, so build them once here
+        self.user_endpoint = f"{self.order_service_url}/user"
+        self.product_endpoint = f"{self.order_service_url}/product"
+        self.order_endpoint = f"{self.order_service_url}/order"
+        self.user_bulk_endpoint = self.user_endpoint + "/bulk"
+        self.product_bulk_endpoint = self.product_endpoint + "/bulk"
+        self.user_lookup_prefix = self.user_endpoint + "/"
+        self.product_lookup_prefix = self.product_endpoint + "/"
+
         # Flag file to track if the server has been started before
         self.restart_flag_file = "restart_flag.txt"
 
+        # Single connection pool so every command reuses the same keep-alive connections.
+        # One connection per worker, and block rather than open throwaway extra ones.
+        # Retries are off so a create is never sent twice.
+        self.http = urllib3.PoolManager(num_pools=1, maxsize=self.MAX_WORKERS, block=True, retries=False)
+
+        # Whether OrderService has the bulk endpoints, checked before the first create
+        self.bulk_supported = None
+
+    def read_commands(self, workload_file: str):
+        """Yield the non-comment, non-empty lines of the workload file"""
+        with open(workload_file, 'rb') as f:
+            st = os.fstat(f.fileno())
+
+            # Pipes and devices (FIFOs, /dev/stdin, <(...)) cannot be mapped and report
+            # no size, so stream them and match the same pattern line by line
+            if not stat.S_ISREG(st.st_mode):
+                for line in f:
+                    match = COMMAND_LINE_RE.match(line)
+                    if match:
+                        yield match.group(1).decode('utf-8')
+                return
+
+            # mmap cannot map an empty file
+            if st.st_size == 0:
+                return
+
+            # One regex sweep over the mapped file finds the real command lines,
+            # skipping comments and blank lines without a Python-level check per line
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for match in COMMAND_LINE_RE.finditer(mm):
+                    yield match.group(1).decode('utf-8')
+
     def parse_workload(self, workload_file: str) -> None:
         """Parse and process each line in the workload file"""
-        with open(workload_file, 'r') as f:
-            lines = [line.strip() for line in f.readlines()]
-
-            # Check if the first non-comment, non-empty line is a restart command
-            first_real_command = None
-            for line in lines:
-                if line and not line.startswith('#') and not line.startswith('//'):
-                    first_real_command = line
-                    break
-            
-            # Check if first command is exactly "restart"
-            restart_command = (first_real_command == "restart")
-
-            # Check if we should reset databases
-            # Reset when: No restart flag exists AND the first command is not a restart
-            if not os.path.exists(self.restart_flag_file) and not restart_command:
-                print("No restart flag found and first command is not restart. Deleting all database files...")
+        commands = self.read_commands(workload_file)
+
+        # Check if the first non-comment, non-empty line is a restart command
+        first_real_command = next(commands, None)
+        if first_real_command is not None:
+            commands = itertools.chain((first_real_command,), commands)
+
+        # Check if first command is exactly "restart"
+        restart_command = (first_real_command == "restart")
+
+        # Create a restart flag file if one doesn't exist
+        # This marks that the services have been started at least once
+        flag_created = self.create_restart_flag()
+
+        # Check if we should reset databases
+        # Reset when: No restart flag exists AND the first command is not a restart
+        if flag_created and not restart_command:
+            print("No restart flag found and first command is not restart. Deleting all database files...")
+            try:
                 self.reset_databases()
+            except BaseException:
+                # Don't leave the flag behind, or later runs would skip the reset
+                os.remove(self.restart_flag_file)
+                raise
 
-            # Create a restart flag file if one doesn't exist
-            # This marks that the services have been started at least once
-            if not os.path.exists(self.restart_flag_file):
-                with open(self.restart_flag_file, 'w') as flag_file:
-                    flag_file.write("Flag indicating that services have been started")
-                print("Created restart flag file")
+        if flag_created:
+            print("Created restart flag file")
 
-            for line in lines:
-                # Skip comments or empty lines
-                if not line or line.startswith('#') or line.startswith('//'):
-                    continue
-                
+        pending = deque()   # (future, keys) of in-flight commands, in workload order
+        last_touch = {}     # user/product -> future of the latest command on it
+        batch = []          # consecutive creates for one service, sent as one request
+        batch_kind = None
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for line in commands:
                 # Handle special commands
-                if line == "shutdown":
-                    print("Shutdown command detected")
-                    # Remove restart flag file - this will make the next run check if first command is restart
-                    if os.path.exists(self.restart_flag_file):
-                        os.remove(self.restart_flag_file)
-                        print("Removed restart flag file due to shutdown")
-                    # The actual shutdown will be handled by runme.sh
-                    continue
-                elif line == "restart":
-                    print("Restart command detected, keeping existing database")
-                    # The main logic for restart is handled at the beginning when checking first command
+                if line in BARRIERS:
+                    # Barrier: everything before it must finish first
+                    self.submit_batch(executor, batch, pending, last_touch)
+                    self.wait_for_pending(pending, last_touch)
+
+                    if line == "shutdown":
+                        print("Shutdown command detected")
+                        # Remove restart flag file - this will make the next run check if first command is restart
+                        try:
+                            os.remove(self.restart_flag_file)
+                            print("Removed restart flag file due to shutdown")
+                        except FileNotFoundError:
+                            pass
+                        # The actual shutdown will be handled by runme.sh
+                    else:
+                        print("Restart command detected, keeping existing database")
+                        # The main logic for restart is handled at the beginning when checking first command
                     continue
-                
+
+                # Split the line once; everything downstream works on the tokens
+                command = self.tokenize(line)
+
+                # Consecutive USER/PRODUCT creates are collected into one bulk request
+                kind = self.bulk_kind(command)
+                if batch and (kind is None or kind != batch_kind or len(batch) == self.BULK_LIMIT):
+                    self.submit_batch(executor, batch, pending, last_touch)
+                batch.append(command)
+                batch_kind = kind
+
                 # Process regular commands
-                self.process_command(line)
+                if kind is None:
+                    self.submit_batch(executor, batch, pending, last_touch)
 
-    def reset_databases(self):
-        """Reset all database files by deleting and recreating them"""
-
-        # Define database file paths
-        db_files = [
-            "compiled/UserService/users.txt",
-            "compiled/ProductService/products.txt",
-            "compiled/OrderService/orders.txt"
-        ]
-
-        # Delete all database files
-        for db_file in db_files:
-            if os.path.exists(db_file):
-                os.remove(db_file)
-                print(f"Deleted {db_file}")
-            else:
-                print(f"{db_file} not found, skipping.")
+            self.submit_batch(executor, batch, pending, last_touch)
+            self.wait_for_pending(pending, last_touch)
 
-        # Recreate fresh empty database files
-        for db_file in db_files:
-            os.makedirs(os.path.dirname(db_file), exist_ok=True)  # Ensure directories exist
-            open(db_file, 'w').close()  # Create an empty file
-            print(f"Recreated fresh database file: {db_file}")
+        sys.stdout.flush()
 
-    def process_command(self, line: str) -> None:
-        """Process a single command line"""
-        parts = line.split()
-        if not parts:
+    def submit_batch(self, executor: ThreadPoolExecutor, batch: list, pending: deque, last_touch: dict) -> None:
+        """Submit the collected commands as one unit of work and empty the batch"""
+        if not batch:
             return
+
+        # Commands on the same user/product must run in workload order,
+        # so chain the batch behind the earlier commands it depends on
+        keys = set()
+        for command in batch:
+            keys |= self.command_keys(command)
+        depends_on = {last_touch[key] for key in keys if key in last_touch}
+
+        future = executor.submit(self.process_after, depends_on, list(batch))
+        for key in keys:
+            last_touch[key] = future
+        pending.append((future, keys))
+        batch.clear()
+
+        # Bound the work queued ahead of the workers: once too much is in flight,
+        # block on the oldest half and print their results before reading further
+        if len(pending) >= self.MAX_PENDING:
+            self.wait_for_pending(pending, last_touch, keep=self.MAX_PENDING // 2)
+
+    def process_after(self, depends_on: set, commands: list) -> list:
+        """Process commands once the commands they depend on have finished"""
+        # Dependencies were submitted earlier, so they are already running or done
+        wait(depends_on)
+        if len(commands) == 1:
+            return [self.process_command(commands[0])]
+        return self.process_bulk(commands)
+
+    def wait_for_pending(self, pending: deque, last_touch: dict, keep: int = 0) -> None:
+        """Wait for the oldest in-flight commands until `keep` remain, printing their results in workload order"""
+        output = []
+        while len(pending) > keep:
+            future, keys = pending.popleft()
+
+            # A finished command is no longer a dependency, so drop the entries still
+            # pointing at it; otherwise every distinct user/product keeps its results alive
+            for key in keys:
+                if last_touch.get(key) is future:
+                    del last_touch[key]
+
+            for result in future.result():
+                if result is not None:
+                    output.append(result)
+                    output.append(b"\n")
+
+        # Results are raw bytes, so write them in one go to the binary buffer
+        # after flushing whatever status messages were printed before them
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"".join(output))
+
+    def tokenize(self, line: str) -> Command:
+        """Split a command line into a Command, building its request payload once"""
+        parts = line.split()
         service = parts[0].upper()
-        command = parts[1].lower() if len(parts) > 1 else ""
+        name = parts[1].lower() if len(parts) > 1 else ""
+        args = parts[2:]
 
-        if service == "USER":
-            self.handle_user_command(command, parts[2:])
-        elif service == "PRODUCT":
-            self.handle_product_command(command, parts[2:])
-        elif service == "ORDER":
-            self.handle_order_command(command, parts[2:])
+        build_payload = PAYLOAD_BUILDERS.get((service, name))
+        payload = build_payload(self, args) if build_payload is not None else None
+        return Command(service, name, args, payload)
 
-    def handle_user_command(self, command: str, args: list) -> None:
-        """Handle USER service commands by passing them to OrderService"""
-        base_endpoint = f"{self.order_service_url}/user"
+    def bulk_kind(self, command: Command) -> Optional[str]:
+        """Return the service of a create command that can be sent in bulk, else None"""
+        if command.name == "create" and command.service in BULK_COMMANDS and self.supports_bulk():
+            return command.service
+        return None
 
-        if command == "create":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {
-                    "command": "create",  
-                    "id": int(args[0]),
-                    "username": args[1],
-                    "email": args[2],
-                    "password": args[3]
-                }
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-          
-        elif command == "get":
+    def supports_bulk(self) -> bool:
+        """Check once whether OrderService has the bulk endpoints"""
+        if self.bulk_supported is None:
+            # Probe with a GET, which changes nothing whichever handler ends up serving it
             try:
-                user_id = args[0]
-                endpoint = f"{base_endpoint}/{user_id}"
-                response = requests.get(endpoint)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-
-        elif command == "update":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {"command": "update", "id": int(args[0])}
-                
-                # Parse update fields
-                for arg in args[1:]:
-                    key, value = arg.split(':', 1)
-                    payload[key] = value
-
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-        
-        elif command == "delete":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {
-                    "command": "delete",  # Communicate intent to OrderService
-                    "id": int(args[0]),
-                    "username": args[1],
-                    "email": args[2],
-                    "password": args[3]
-                }
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-      
-    def handle_product_command(self, command: str, args: list) -> None:
+                response = self.http.request('GET', self.user_bulk_endpoint)
+                self.bulk_supported = response.status == 200 and self.BULK_HEADER in response.headers
+            except urllib3.exceptions.HTTPError:
+                self.bulk_supported = False
+        return self.bulk_supported
+
+    def command_keys(self, command: Command) -> set:
+        """Return the users/products a command reads or modifies"""
+        args = command.args
+
+        if command.service == "ORDER":
+            # An order touches both the product and the user placing it
+            return {("PRODUCT", id_key(args[0]) if len(args) > 0 else None),
+                    ("USER", id_key(args[1]) if len(args) > 1 else None)}
+        return {(command.service, id_key(args[0]) if args else None)}
+
+    def create_restart_flag(self) -> bool:
+        """Create the restart flag file, returning False if it already existed"""
+        # O_EXCL makes the existence check and the create a single open() call
+        try:
+            fd = os.open(self.restart_flag_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return False
+        try:
+            os.write(fd, b"Flag indicating that services have been started")
+        finally:
+            os.close(fd)
+        return True
+
+    def reset_databases(self):
+        """Reset all database files by truncating them, creating any that are missing"""
+
+        # Ensure each database directory exists, once per directory
+        for db_dir in {os.path.dirname(db_file) for db_file in self.DB_FILES}:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # O_TRUNC | O_CREAT both empties an existing file and creates a missing one
+        for db_file in self.DB_FILES:
+            os.close(os.open(db_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+            print(f"Recreated fresh database file: {db_file}")
+
+    def process_command(self, command: Command) -> Optional[bytes]:
+        """Process a single tokenized command and return the result line to print"""
+        handler = SERVICE_COMMANDS.get(command.service)
+        if handler is None:
+            return None
+        return handler(self, command)
+
+    def process_bulk(self, commands: list) -> list:
+        """Process consecutive create commands for one service in a single request"""
+        return BULK_COMMANDS[commands[0].service](self, commands)
+
+    def send_bulk(self, bulk_endpoint: str, payloads: list) -> list:
+        """POST encoded payloads to the bulk endpoint and return one result line per payload"""
+        body = self.BULK_PREFIX + b','.join(payloads) + self.BULK_SUFFIX
+        try:
+            response = self.http.request('POST', bulk_endpoint, body=body, headers=self.HEADERS)
+            results = decode_json(response.data) if response.status == 200 else None
+        except (urllib3.exceptions.HTTPError, ValueError):
+            results = None
+
+        # Some of the batch may already be applied, so never re-send it; without
+        # a result per payload, each one is reported as failed
+        if not isinstance(results, list) or len(results) != len(payloads):
+            return [self.FAILED] * len(payloads)
+
+        lines = []
+        for result in results:
+            if result["status_code"] == 200:
+                lines.append(b"Successful:  " + result["body"].encode('utf-8'))
+            else:
+                lines.append(b"Failed:  " + result["body"].encode('utf-8'))
+        return lines
+
+    def handle_bulk(self, bulk_endpoint: str, commands: list) -> list:
+        """Send valid create payloads in bulk, keeping results in command order"""
+        results = [None] * len(commands)
+        payloads = []
+        positions = []
+        for i, command in enumerate(commands):
+            if command.payload is None:
+                results[i] = self.FAILED
+            else:
+                payloads.append(command.payload)
+                positions.append(i)
+
+        if payloads:
+            for i, line in zip(positions, self.send_bulk(bulk_endpoint, payloads)):
+                results[i] = line
+        return results
+
+    def handle_user_bulk(self, commands: list) -> list:
+        """Handle consecutive USER create commands with one request to OrderService"""
+        return self.handle_bulk(self.user_bulk_endpoint, commands)
+
+    def handle_product_bulk(self, commands: list) -> list:
+        """Handle consecutive PRODUCT create commands with one request to OrderService"""
+        return self.handle_bulk(self.product_bulk_endpoint, commands)
+
+    def user_create_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for a USER create command, or None if the arguments are invalid"""
+        if len(args) < 4:
+            return None
+        user_id = to_int(args[0])
+        if user_id is None:
+            return None
+
+        username, email, password = args[1], args[2], args[3]
+        if is_plain(username) and is_plain(email) and is_plain(password):
+            return self.USER_CREATE_TEMPLATE.format(user_id, username, email, password).encode('ascii')
+        return encode_json({
+            "command": "create",
+            "id": user_id,
+            "username": username,
+            "email": email,
+            "password": password
+        })
+
+    def user_delete_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for a USER delete command, or None if the arguments are invalid"""
+        if len(args) < 4:
+            return None
+        user_id = to_int(args[0])
+        if user_id is None:
+            return None
+        return encode_json({
+            "command": "delete",  # Communicate intent to OrderService
+            "id": user_id,
+            "username": args[1],
+            "email": args[2],
+            "password": args[3]
+        })
+
+    def product_create_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for a PRODUCT create command, or None if the arguments are invalid"""
+        if len(args) < 5:
+            return None
+        product_id = to_int(args[0])
+        price = to_float(args[3])
+        quantity = to_int(args[4])
+        if product_id is None or price is None or quantity is None:
+            return None
+
+        name, description = args[1], args[2]
+        if is_plain(name) and is_plain(description):
+            return self.PRODUCT_CREATE_TEMPLATE.format(product_id, name, description, price, quantity).encode('ascii')
+        return encode_json({
+            "command": "create",
+            "id": product_id,
+            "name": name,
+            "description": description,
+            "price": price,
+            "quantity": quantity
+        })
+
+    def product_delete_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for a PRODUCT delete command, or None if the arguments are invalid"""
+        if len(args) < 4:
+            return None
+        product_id = to_int(args[0])
+        price = to_float(args[2])
+        quantity = to_int(args[3])
+        if product_id is None or price is None or quantity is None:
+            return None
+        return encode_json({
+            "command": "delete",
+            "id": product_id,
+            "name": args[1],
+            "price": price,
+            "quantity": quantity
+        })
+
+    def update_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for a USER/PRODUCT update command, or None if the arguments are invalid"""
+        if not args:
+            return None
+        entity_id = to_int(args[0])
+        if entity_id is None:
+            return None
+        payload = {"command": "update", "id": entity_id}
+
+        # Parse update fields
+        for arg in args[1:]:
+            key, sep, value = arg.partition(':')
+            if not sep:
+                return None
+            payload[key] = value
+        return encode_json(payload)
+
+    def order_place_payload(self, args: list) -> Optional[bytes]:
+        """Build the payload for an ORDER place command, or None if the arguments are invalid"""
+        if len(args) < 3:
+            return None
+        product_id = to_int(args[0])
+        user_id = to_int(args[1])
+        quantity = to_int(args[2])
+        if product_id is None or user_id is None or quantity is None:
+            return None
+        return encode_json({
+            "command": "place order",
+            "product_id": product_id,
+            "user_id": user_id,
+            "quantity": quantity
+        })
+
+    def format_response(self, response) -> bytes:
+        """Format a response as the Successful/Failed line printed for a command"""
+        # The body is only echoed, so it is kept as bytes and never decoded
+        if response.status == 200:
+            return b"Successful:  " + response.data
+        return b"Failed:  " + response.data
+
+    def post(self, endpoint: str, payload: bytes, failed: bytes = FAILED) -> bytes:
+        """POST an encoded payload and return its result line, or `failed` if the request could not be sent"""
+        try:
+            response = self.http.request('POST', endpoint, body=payload, headers=self.HEADERS)
+        except urllib3.exceptions.HTTPError:
+            return failed
+        return self.format_response(response)
+
+    def get(self, endpoint: str) -> bytes:
+        """GET an endpoint and return its result line"""
+        try:
+            response = self.http.request('GET', endpoint)
+        except urllib3.exceptions.HTTPError:
+            return self.FAILED
+        return self.format_response(response)
+
+    def handle_user_command(self, command: Command) -> Optional[bytes]:
+        """Handle USER service commands by passing them to OrderService"""
+        handler = USER_COMMANDS.get(command.name)
+        if handler is None:
+            return None
+        return handler(self, command)
+
+    def handle_product_command(self, command: Command) -> Optional[bytes]:
         """Handle PRODUCT service commands by passing them to OrderService"""
-        base_endpoint = f"{self.order_service_url}/product"
+        handler = PRODUCT_COMMANDS.get(command.name)
+        if handler is None:
+            return None
+        return handler(self, command)
 
-        if command == "create":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {
-                    "command": "create",
-                    "id": int(args[0]),
-                    "name": args[1],
-                    "description": args[2],
-                    "price": float(args[3]),
-                    "quantity": int(args[4])
-                }
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-            
-        elif command == "info":
-            try:
-                product_id = args[0]
-                endpoint = f"{base_endpoint}/{product_id}"
-                response = requests.get(endpoint)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-            
-        elif command == "update":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {"command": "update", "id": int(args[0])}
-                
-                # Parse update fields
-                for arg in args[1:]:
-                    key, value = arg.split(':', 1)
-                    payload[key] = value
-
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-        
-        elif command == "delete":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {
-                    "command": "delete",
-                    "id": int(args[0]),
-                    "name": args[1],
-                    "price": float(args[2]),
-                    "quantity": int(args[3])
-                }
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed:  {}")
-
-    def handle_order_command(self, command: str, args: list) -> None:
-        """Handle ORDER service commands directly via OrderService"""       
-        base_endpoint = f"{self.order_service_url}/order"
-
-        if command == "place":
-            try:
-                headers = {'Content-Type' : 'application/json'}
-                payload = {
-                    "command": "place order",
-                    "product_id": int(args[0]),
-                    "user_id": int(args[1]),
-                    "quantity": int(args[2])
-                }
-                response = requests.post(base_endpoint, json=payload, headers=headers)
-                if response.status_code == 200:
-                    print("Successful: ", response.text)
-                else:
-                    print("Failed: ", response.text)
-            except Exception as e:
-                print("Failed: {\"status\":\"Invalid Request\"}")
+    def handle_order_command(self, command: Command) -> Optional[bytes]:
+        """Handle ORDER service commands directly via OrderService"""
+        handler = ORDER_COMMANDS.get(command.name)
+        if handler is None:
+            return None
+        return handler(self, command)
+
+    def user_create(self, command: Command) -> bytes:
+        """USER create <id> <username> <email> <password>"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.user_endpoint, command.payload)
+
+    def user_get(self, command: Command) -> bytes:
+        """USER get <id>"""
+        if not command.args:
+            return self.FAILED
+        return self.get(self.user_lookup_prefix + command.args[0])
+
+    def user_update(self, command: Command) -> bytes:
+        """USER update <id> [field:value ...]"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.user_endpoint, command.payload)
+
+    def user_delete(self, command: Command) -> bytes:
+        """USER delete <id> <username> <email> <password>"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.user_endpoint, command.payload)
+
+    def product_create(self, command: Command) -> bytes:
+        """PRODUCT create <id> <name> <description> <price> <quantity>"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.product_endpoint, command.payload)
+
+    def product_info(self, command: Command) -> bytes:
+        """PRODUCT info <id>"""
+        if not command.args:
+            return self.FAILED
+        return self.get(self.product_lookup_prefix + command.args[0])
+
+    def product_update(self, command: Command) -> bytes:
+        """PRODUCT update <id> [field:value ...]"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.product_endpoint, command.payload)
+
+    def product_delete(self, command: Command) -> bytes:
+        """PRODUCT delete <id> <name> <price> <quantity>"""
+        if command.payload is None:
+            return self.FAILED
+        return self.post(self.product_endpoint, command.payload)
+
+    def order_place(self, command: Command) -> bytes:
+        """ORDER place <product_id> <user_id> <quantity>"""
+        if command.payload is None:
+            return self.ORDER_FAILED
+        return self.post(self.order_endpoint, command.payload, failed=self.ORDER_FAILED)
+
+# Command dispatch tables, looked up once per line instead of walking if/elif chains
+SERVICE_COMMANDS = {
+    "USER": WorkloadParser.handle_user_command,
+    "PRODUCT": WorkloadParser.handle_product_command,
+    "ORDER": WorkloadParser.handle_order_command,
+}
+USER_COMMANDS = {
+    "create": WorkloadParser.user_create,
+    "get": WorkloadParser.user_get,
+    "update": WorkloadParser.user_update,
+    "delete": WorkloadParser.user_delete,
+}
+PRODUCT_COMMANDS = {
+    "create": WorkloadParser.product_create,
+    "info": WorkloadParser.product_info,
+    "update": WorkloadParser.product_update,
+    "delete": WorkloadParser.product_delete,
+}
+ORDER_COMMANDS = {
+    "place": WorkloadParser.order_place,
+}
+BULK_COMMANDS = {
+    "USER": WorkloadParser.handle_user_bulk,
+    "PRODUCT": WorkloadParser.handle_product_bulk,
+}
+
+# Payload builders for commands that send a request body, run once when a line is tokenized
+PAYLOAD_BUILDERS = {
+    ("USER", "create"): WorkloadParser.user_create_payload,
+    ("USER", "update"): WorkloadParser.update_payload,
+    ("USER", "delete"): WorkloadParser.user_delete_payload,
+    ("PRODUCT", "create"): WorkloadParser.product_create_payload,
+    ("PRODUCT", "update"): WorkloadParser.update_payload,
+    ("PRODUCT", "delete"): WorkloadParser.product_delete_payload,
+    ("ORDER", "place"): WorkloadParser.order_place_payload,
+}
 
 def main():
     if len(sys.argv) != 3:
@@ -274,6 +665,9 @@ def main():
     config_file = sys.argv[1]     # config.json
     workload_file = sys.argv[2]   # workload...txt
     
+    # Results are written in batches, so don't flush stdout on every line
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     parser = WorkloadParser(config_file)
     parser.parse_workload(workload_file)
 